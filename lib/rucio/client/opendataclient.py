@@ -58,6 +58,8 @@ class OpenDataClient(BaseClient):
             *,
             state: Optional["OPENDATA_DID_STATE_LITERAL"] = None,
             public: bool = False,
+            limit: Optional[int] = None,
+            after: Optional[str] = None,
     ) -> dict[str, Any]:
         """
         Return a list of Opendata DIDs, optionally filtered by state and access type.
@@ -65,9 +67,11 @@ class OpenDataClient(BaseClient):
         Parameters:
             state: The state to filter DIDs by. If None, all states are included.
             public: If True, queries the public Opendata endpoint. Defaults to False.
+            limit: Maximum number of DIDs to return. If None, all DIDs are returned.
+            after: Pagination cursor, as returned in `next_cursor` of the previous page.
 
         Returns:
-            A dictionary containing the list of Opendata DIDs.
+            A dictionary containing the list of Opendata DIDs and the `next_cursor` to fetch the next page.
 
         Raises:
             ValueError: If both `state` and `public=True` are provided.
@@ -82,6 +86,12 @@ class OpenDataClient(BaseClient):
         if state is not None:
             params['state'] = state
 
+        if limit is not None:
+            params['limit'] = limit
+
+        if after is not None:
+            params['after'] = after
+
         if state is not None and public:
             raise ValueError('state and public cannot be provided at the same time.')
 
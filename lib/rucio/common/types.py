@@ -14,6 +14,7 @@
 
 import sys
 from collections.abc import Callable
+from functools import lru_cache
 from os import PathLike
 
 from rucio.common.constants import DEFAULT_VO
@@ -128,6 +129,17 @@ class InternalScope(InternalType):
         super(InternalScope, self).__init__(value=scope, vo=vo, from_external=from_external)
 
 
+@lru_cache(maxsize=4096)
+def get_internal_scope(scope: str, vo: str = DEFAULT_VO) -> InternalScope:
+    '''
+    Cached constructor for an InternalScope from its external representation.
+
+    InternalScope instances are never mutated, so the same instance can safely be
+    shared between callers asking for the same (scope, vo) pair.
+    '''
+    return InternalScope(scope, vo=vo)
+
+
 LoggerFunction = Callable[..., Any]
 
 
@@ -279,6 +279,10 @@ class APIEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, obj)
 
 
+# Encoders hold no per-call state, so a single instance can be shared
+_API_ENCODER = APIEncoder()
+
+
 def render_json(*args, **kwargs) -> str:
     """ Render a list or a dict as a JSON-formatted string. """
     if args and isinstance(args[0], list):
@@ -287,7 +291,7 @@ def render_json(*args, **kwargs) -> str:
         data = kwargs
     else:
         raise ValueError("Error while serializing object to JSON-formatted string: supported input types are list or dict.")
-    return json.dumps(data, cls=APIEncoder)
+    return _API_ENCODER.encode(data)
 
 
 def datetime_parser(dct: dict[Any, Any]) -> dict[Any, Any]:
@@ -1264,7 +1268,8 @@ def gateway_update_return_dict(
             copied = True
         dictionary['account'] = dictionary['account'].external
 
-    if 'scope' in dictionary.keys() and dictionary['scope'] is not None:
+    # Rows may already carry the external scope string
+    if 'scope' in dictionary.keys() and isinstance(dictionary['scope'], InternalScope):
         if not copied:
             dictionary = dictionary.copy()
             copied = True
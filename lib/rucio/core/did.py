@@ -2636,7 +2636,7 @@ def list_archive_content(
                  models.ConstituentAssociation.name == name)
         )
 
-        for tmp_did in session.execute(stmt).yield_per(5).scalars():
+        for tmp_did in session.execute(stmt).yield_per(1000).scalars():
             yield {'scope': tmp_did.child_scope, 'name': tmp_did.child_name,
                    'bytes': tmp_did.bytes, 'adler32': tmp_did.adler32, 'md5': tmp_did.md5}
     except NoResultFound:
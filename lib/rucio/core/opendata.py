@@ -14,11 +14,11 @@
 
 import json
 import time
-from re import match, search
+from re import match
 from typing import TYPE_CHECKING, Any, Optional, Union, cast
 
 from dogpile.cache.api import NoValue
-from sqlalchemy import and_, delete, insert, update
+from sqlalchemy import and_, delete, insert, or_, update
 from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.sql.expression import bindparam, select
 
@@ -34,9 +34,10 @@ from rucio.core.replica import list_replicas
 from rucio.core.rule import add_rule
 from rucio.db.sqla import models
 from rucio.db.sqla.constants import DIDType, OpenDataDIDState
+from rucio.db.sqla.util import is_unique_violation
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterator, Sequence
 
     from sqlalchemy.orm import Session
 
@@ -46,6 +47,27 @@ if TYPE_CHECKING:
 METRICS = MetricManager(module=__name__)
 REGION = MemcacheRegion(expiration_time=7200)
 
+# Statements built once so the compiled SQL cache is always hit
+_OPENDATA_DID_EXISTS_STMT = select(
+    models.OpenDataDid.scope
+).where(
+    and_(
+        models.OpenDataDid.scope == bindparam("scope"),
+        models.OpenDataDid.name == bindparam("name")
+    )
+).limit(1)
+
+_OPENDATA_DID_DELETE_STMT = delete(
+    models.OpenDataDid
+).where(
+    and_(
+        models.OpenDataDid.scope == bindparam("scope"),
+        models.OpenDataDid.name == bindparam("name")
+    )
+)
+
+_OPENDATA_DID_STATES = {s.name.lower(): s for s in OpenDataDIDState}
+
 
 def is_valid_opendata_did_state(state: str) -> bool:
     """
@@ -58,11 +80,7 @@ def is_valid_opendata_did_state(state: str) -> bool:
         True if the state is valid, False otherwise.
     """
 
-    try:
-        _ = OpenDataDIDState[state.upper()]
-        return True
-    except KeyError:
-        return False
+    return state.lower() in _OPENDATA_DID_STATES
 
 
 def validate_opendata_did_state(state: str) -> "OPENDATA_DID_STATE_LITERAL":
@@ -80,12 +98,12 @@ def validate_opendata_did_state(state: str) -> "OPENDATA_DID_STATE_LITERAL":
     state = state.lower()
     if not is_valid_opendata_did_state(state):
         raise OpenDataError(
-            f"Invalid state '{state}'. Valid opendata states are: {', '.join([s.name.lower() for s in OpenDataDIDState])}")
+            f"Invalid state '{state}'. Valid opendata states are: {', '.join(_OPENDATA_DID_STATES)}")
 
     return cast("OPENDATA_DID_STATE_LITERAL", state)
 
 
-def opendata_state_str_to_enum(state: "OPENDATA_DID_STATE_LITERAL") -> OpenDataDIDState:
+def opendata_state_str_to_enum(state: str) -> OpenDataDIDState:
     """
     Convert a string representation of an Opendata DID state to the corresponding OpenDataDIDState enum.
     If the state is invalid, raise an OpenDataError with a message listing valid states.
@@ -97,7 +115,11 @@ def opendata_state_str_to_enum(state: "OPENDATA_DID_STATE_LITERAL") -> OpenDataD
         The corresponding OpenDataDIDState enum value.
     """
 
-    return OpenDataDIDState[validate_opendata_did_state(state).upper()]
+    try:
+        return _OPENDATA_DID_STATES[state.lower()]
+    except KeyError:
+        raise OpenDataError(
+            f"Invalid state '{state.lower()}'. Valid opendata states are: {', '.join(_OPENDATA_DID_STATES)}")
 
 
 def _check_opendata_did_exists(
@@ -110,36 +132,39 @@ def _check_opendata_did_exists(
     Check if an Opendata DID does exist in the database.
     """
 
-    query = select(models.OpenDataDid).where(
-        and_(
-            models.OpenDataDid.scope == scope,
-            models.OpenDataDid.name == name
-        )
-    )
-    result = session.execute(query).scalar()
-    return result is not None
+    return session.execute(_OPENDATA_DID_EXISTS_STMT, {"scope": scope, "name": name}).scalar() is not None
 
 
-def list_opendata_dids(
+def stream_opendata_dids(
         *,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
+        after_scope: Optional["InternalScope"] = None,
+        after_name: Optional[str] = None,
         state: Optional[OpenDataDIDState] = None,
         session: "Session",
-) -> dict[str, list[dict[str, Any]]]:
+) -> "Iterator[dict[str, Any]]":
     """
-    List Opendata DIDs with optional filtering by state, limit, and offset.
+    Yield Opendata DIDs with optional filtering by state, limit, and offset, as they are fetched from the database.
+
+    Results are ordered by scope and name. Keyset pagination is supported by passing the scope and name of the
+    last DID of the previous page as `after_scope` and `after_name`, which avoids scanning the skipped rows.
 
     Parameters:
         limit: Maximum number of DIDs to return.
-        offset: Offset for pagination.
+        offset: Offset for pagination. Deprecated in favour of `after_scope` and `after_name`.
+        after_scope: Only return DIDs after this scope (in combination with `after_name`).
+        after_name: Only return DIDs after this name (in combination with `after_scope`).
         state: Filter by Opendata DID state.
         session: SQLAlchemy session to use for the query.
 
     Returns:
-        A dictionary containing the total count, offset, and a list of DIDs.
+        An iterator over the DIDs.
     """
 
+    if (after_scope is None) != (after_name is None):
+        raise exception.InputValidationError("'after_scope' and 'after_name' must be provided together.")
+
     query = select(
         models.OpenDataDid.scope,
         models.OpenDataDid.name,
@@ -147,9 +172,22 @@ def list_opendata_dids(
         models.OpenDataDid.created_at,
         models.OpenDataDid.updated_at,
     ).order_by(
-        models.OpenDataDid.updated_at
+        models.OpenDataDid.scope,
+        models.OpenDataDid.name,
     )
 
+    if after_scope is not None:
+        # Expanded form of (scope, name) > (:after_scope, :after_name), row values are not supported by all dialects
+        query = query.where(
+            or_(
+                models.OpenDataDid.scope > after_scope,
+                and_(
+                    models.OpenDataDid.scope == after_scope,
+                    models.OpenDataDid.name > after_name,
+                )
+            )
+        )
+
     if limit is not None:
         query = query.limit(limit)
 
@@ -159,8 +197,41 @@ def list_opendata_dids(
     if state is not None:
         query = query.where(models.OpenDataDid.state == state)
 
-    dids = [{"scope": scope, "name": name, "state": state, "created_at": created_at, "updated_at": updated_at} for
-            scope, name, state, created_at, updated_at in session.execute(query)]
+    for scope, name, state, created_at, updated_at in session.execute(query).yield_per(500):
+        yield {"scope": scope, "name": name, "state": state, "created_at": created_at, "updated_at": updated_at}
+
+
+def list_opendata_dids(
+        *,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        after_scope: Optional["InternalScope"] = None,
+        after_name: Optional[str] = None,
+        state: Optional[OpenDataDIDState] = None,
+        session: "Session",
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    List Opendata DIDs with optional filtering by state, limit, and offset.
+    See `stream_opendata_dids` for the ordering and pagination.
+
+    Parameters:
+        limit: Maximum number of DIDs to return.
+        offset: Offset for pagination. Deprecated in favour of `after_scope` and `after_name`.
+        after_scope: Only return DIDs after this scope (in combination with `after_name`).
+        after_name: Only return DIDs after this name (in combination with `after_scope`).
+        state: Filter by Opendata DID state.
+        session: SQLAlchemy session to use for the query.
+
+    Returns:
+        A dictionary containing the total count, offset, and a list of DIDs.
+    """
+
+    dids = list(stream_opendata_dids(limit=limit,
+                                     offset=offset,
+                                     after_scope=after_scope,
+                                     after_name=after_name,
+                                     state=state,
+                                     session=session))
 
     response = {
         "total": len(dids),
@@ -294,6 +365,9 @@ def get_opendata_did_files(
 
     Returns:
         A dictionary containing the list of files including replicas, cache hit status, and time elapsed in milliseconds.
+
+    Raises:
+        OpenDataDataIdentifierNotFound: If the underlying DID does not exist.
     """
 
     time_start = time.perf_counter()
@@ -310,32 +384,20 @@ def get_opendata_did_files(
             }
             return result
 
-    query = select(
-        models.OpenDataDid.scope,
-        models.OpenDataDid.name,
-    ).where(
-        and_(
-            models.OpenDataDid.scope == scope,
-            models.OpenDataDid.name == name,
-        )
-    )
-
-    query_result = session.execute(query).mappings().fetchone()
-
-    if not query_result:
+    # Opendata DIDs reference the DIDs table, so a missing DID is reported by `list_files`
+    try:
+        file_list = [
+            {
+                "scope": file["scope"],
+                "name": file["name"],
+                "bytes": file["bytes"],
+                "adler32": file["adler32"],
+            }
+            for file in list_files(scope=scope, name=name, session=session)
+        ]
+    except exception.DataIdentifierNotFound:
         raise exception.OpenDataDataIdentifierNotFound(f"OpenData DID {scope}:{name} not found.")
 
-    files = list_files(scope=scope, name=name)
-    file_list = [
-        {
-            "scope": file["scope"],
-            "name": file["name"],
-            "bytes": file["bytes"],
-            "adler32": file["adler32"],
-        }
-        for file in files
-    ]
-
     rse_expression = config_get("opendata", "rse_expression", raise_exception=True)
 
     for i, file in enumerate(file_list):
@@ -395,13 +457,48 @@ def get_opendata_did(
         A dictionary containing info about the specified DID which include "scope", "name", "state", "meta" (if requested), etc.
     """
 
-    query = select(
+    columns = [
         models.OpenDataDid.scope,
         models.OpenDataDid.name,
         models.OpenDataDid.state,
         models.OpenDataDid.created_at,
         models.OpenDataDid.updated_at,
-    ).where(
+    ]
+    if include_doi:
+        columns.append(models.OpenDataDOI.doi)
+    if include_record_id:
+        columns.append(models.OpenDataRecord.record_id)
+    if include_metadata:
+        columns.append(models.OpenDataMeta.meta)
+
+    # DOI, record ID and metadata are fetched in the same round-trip through outer joins
+    query = select(*columns).select_from(models.OpenDataDid)
+    if include_doi:
+        query = query.outerjoin(
+            models.OpenDataDOI,
+            and_(
+                models.OpenDataDOI.scope == models.OpenDataDid.scope,
+                models.OpenDataDOI.name == models.OpenDataDid.name,
+            )
+        )
+    if include_record_id:
+        query = query.outerjoin(
+            models.OpenDataRecord,
+            and_(
+                models.OpenDataRecord.scope == models.OpenDataDid.scope,
+                models.OpenDataRecord.name == models.OpenDataDid.name,
+            )
+        )
+    if include_metadata:
+        query = query.outerjoin(
+            models.OpenDataMeta,
+            and_(
+                models.OpenDataMeta.scope == models.OpenDataDid.scope,
+                models.OpenDataMeta.name == models.OpenDataDid.name,
+            )
+        )
+
+    query = query.where(
         and_(
             models.OpenDataDid.scope == scope,
             models.OpenDataDid.name == name,
@@ -418,34 +515,35 @@ def get_opendata_did(
 
     result = dict(result)
 
-    if include_doi:
-        result["doi"] = get_opendata_doi(scope=scope, name=name, session=session)
-    if include_record_id:
-        result["record_id"] = get_opendata_record_id(scope=scope, name=name, session=session)
-    if include_metadata:
-        result["meta"] = get_opendata_meta(scope=scope, name=name, session=session)
+    if include_record_id and result["record_id"] is not None:
+        result["record_id"] = int(result["record_id"])
+    if include_metadata and result["meta"] is None:
+        result["meta"] = {}
     if include_rule:
         result["rule"] = _fetch_opendata_rule(scope=scope, name=name, session=session)
     if include_files:
         opendata_files = get_opendata_did_files(scope=scope, name=name, use_cache=True, session=session)
         result["files"] = opendata_files["files"]
 
-        bytes_sum = sum(file["bytes"] for file in result["files"])
+        # Single pass over the files, `rpartition` avoids building a list per URI
+        bytes_sum = 0
         extensions = set()
         replicas_missing = 0
         for file in result["files"]:
-            if "uris" not in file or not file["uris"]:
+            bytes_sum += file["bytes"]
+            uris = file.get("uris")
+            if not uris:
                 replicas_missing += 1
                 continue
-            for replica in file["uris"]:
-                filename = replica.split("/")[-1]
-                if "." in filename:
-                    extensions.add(filename.split(".")[-1])
+            for replica in uris:
+                _, dot, extension = replica.rpartition("/")[2].rpartition(".")
+                if dot:
+                    extensions.add(extension)
 
         result["files_summary"] = {
             "length": len(result["files"]),
             "bytes": bytes_sum,
-            "extensions": list(extensions),
+            "extensions": sorted(extensions),
             "replicas_missing": replicas_missing,
             "request_cache_hit": opendata_files["cache_hit"],
             "request_time_elapsed_millis": opendata_files["time_elapsed_millis"],
@@ -499,32 +597,20 @@ def add_opendata_dids(
         DataIdentifierNotFound: If any of the DIDs do not exist in the database.
     """
 
-    for did in dids:
-        if "scope" not in did or "name" not in did:
-            raise exception.InputValidationError("DID must have 'scope' and 'name' keys.")
+    try:
+        values = [{"scope": did["scope"], "name": did["name"]} for did in dids]
+    except KeyError:
+        raise exception.InputValidationError("DID must have 'scope' and 'name' keys.")
+
+    if not values:
+        return
 
     try:
-        # The default state is DRAFT, set in the model
-        session.execute(
-            insert(models.OpenDataDid),
-            [
-                {
-                    "scope": did["scope"],
-                    "name": did["name"],
-                }
-                for did in dids]
-        )
+        # The default state is DRAFT, set in the model. A single executemany
+        # round-trip; the foreign key to the DIDs table checks existence.
+        session.execute(insert(models.OpenDataDid), values)
     except IntegrityError as error:
-        msg = str(error)
-
-        if (
-                search(r'ORA-00001: unique constraint \([^)]+DIDS_OPENDATA_PK\) violated', msg)
-                or search(r'UNIQUE constraint failed: dids_opendata\.scope, dids_opendata\.name', msg)
-                or search(r'1062.*Duplicate entry.*for key', msg)
-                or search(r'duplicate key value violates unique constraint', msg)
-                or search(r'UniqueViolation.*duplicate key value violates unique constraint', msg)
-                or search(r'columns?.*not unique', msg)
-        ):
+        if is_unique_violation(error):
             raise exception.OpenDataDataIdentifierAlreadyExists()
 
         raise exception.DataIdentifierNotFound()
@@ -570,14 +656,7 @@ def delete_opendata_did(
         raise exception.OpenDataInvalidState(
             f"OpenData entry '{scope}:{name}' not in a valid state for deletion. State: {result['state']}, expected: {OpenDataDIDState.DRAFT}")
 
-    delete_stmt = delete(models.OpenDataDid).where(
-        and_(
-            models.OpenDataDid.scope == bindparam("scope"),
-            models.OpenDataDid.name == bindparam("name")
-        )
-    )
-
-    result = session.execute(delete_stmt, {"scope": scope, "name": name})
+    result = session.execute(_OPENDATA_DID_DELETE_STMT, {"scope": scope, "name": name})
 
     if result.rowcount == 0:
         raise ValueError(f"Error deleting Opendata entry '{scope}:{name}'.")
@@ -953,15 +1032,7 @@ def update_opendata_doi(
             raise ValueError(f"Error updating Opendata DOI for DID '{scope}:{name}'.")
 
     except IntegrityError as error:
-        msg = str(error)
-
-        if (
-                search(r'ORA-00001: unique constraint \([^)]+\) violated', msg)
-                or search(r'UNIQUE constraint failed: dids_opendata_doi\.doi', msg)
-                or search(r'1062.*Duplicate entry.*for key', msg)
-                or search(r'duplicate key value violates unique constraint', msg)
-                or search(r'columns?.*not unique', msg)
-        ):
+        if is_unique_violation(error):
             raise exception.OpenDataDuplicateDOI(doi=doi)
 
         raise exception.OpenDataError()
@@ -1026,15 +1097,7 @@ def update_opendata_record_id(
             raise ValueError(f"Error updating Opendata Record ID for DID '{scope}:{name}'.")
 
     except IntegrityError as error:
-        msg = str(error)
-
-        if (
-                search(r'ORA-00001: unique constraint \([^)]+\) violated', msg)
-                or search(r'UNIQUE constraint failed: dids_opendata_record\.record_id', msg)
-                or search(r'1062.*Duplicate entry.*for key', msg)
-                or search(r'duplicate key value violates unique constraint', msg)
-                or search(r'columns?.*not unique', msg)
-        ):
+        if is_unique_violation(error):
             raise exception.OpenDataDuplicateRecordID(record_id=record_id)
 
         raise exception.OpenDataError()
@@ -58,7 +58,7 @@ def add_quarantined_replicas(rse_id: str, replicas: list[dict[str, Any]], *, ses
         ).where(
             or_(*file_clause)
         )
-        existing_replicas = [(scope, name, rseid) for scope, name, rseid in session.execute(stmt).all()]
+        existing_replicas = {(scope, name, rseid) for scope, name, rseid in session.execute(stmt).all()}
         replicas = [replica for replica in replicas if (replica.get('scope', None), replica.get('name', None), rse_id) not in existing_replicas]
 
     # Exclude files that have already been added to the quarantined
@@ -73,7 +73,7 @@ def add_quarantined_replicas(rse_id: str, replicas: list[dict[str, Any]], *, ses
     ).where(
         or_(*quarantine_clause)
     )
-    quarantine_replicas = [(path, rseid) for path, rseid in session.execute(stmt).all()]
+    quarantine_replicas = {(path, rseid) for path, rseid in session.execute(stmt).all()}
     replicas = [replica for replica in replicas if (replica['path'], rse_id) not in quarantine_replicas]
 
     values = [{'rse_id': rse_id,
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from re import match
 from traceback import format_exc
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -24,6 +23,7 @@ from rucio.common.exception import AccountNotFound, Duplicate, RucioException, S
 from rucio.core.vo import vo_exists
 from rucio.db.sqla import models
 from rucio.db.sqla.constants import AccountStatus, ScopeStatus
+from rucio.db.sqla.util import is_unique_violation
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Sequence
@@ -61,12 +61,7 @@ def add_scope(
     try:
         new_scope.save(session=session)
     except IntegrityError as e:
-        if match('.*IntegrityError.*ORA-00001: unique constraint.*SCOPES_PK.*violated.*', e.args[0]) \
-                or match('.*IntegrityError.*Duplicate entry.*for key.*', e.args[0]) \
-                or match('.*IntegrityError.*UNIQUE constraint failed: scopes.scope.*', e.args[0]) \
-                or match('.*IntegrityError.*duplicate key value violates unique constraint.*', e.args[0]) \
-                or match('.*UniqueViolation.*duplicate key value violates unique constraint.*', e.args[0]) \
-                or match('.*IntegrityError.*columns? .*not unique.*', e.args[0]):
+        if is_unique_violation(e):
             raise Duplicate('Scope \'%s\' already exists!' % scope)
         else:
             raise RucioException(e)
@@ -203,11 +198,11 @@ def check_scope(
     """
 
     stmt = select(
-        models.Scope
+        models.Scope.scope
     ).where(
         models.Scope.scope == scope_to_check
-    )
-    return bool(session.execute(stmt).scalar())
+    ).limit(1)
+    return session.execute(stmt).scalar() is not None
 
 
 def is_scope_owner(
@@ -224,12 +219,12 @@ def is_scope_owner(
     :returns: True or false
     """
     stmt = select(
-        models.Scope
+        models.Scope.scope
     ).where(
         and_(models.Scope.scope == scope,
              models.Scope.account == account)
-    )
-    return bool(session.execute(stmt).scalar())
+    ).limit(1)
+    return session.execute(stmt).scalar() is not None
 
 
 def update_scope(scope: "InternalScope", account: "InternalAccount", *, session: "Session") -> None:
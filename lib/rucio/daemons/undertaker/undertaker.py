@@ -47,6 +47,8 @@ logging.getLogger("requests").setLevel(logging.CRITICAL)
 
 METRICS = MetricManager(module=__name__)
 graceful_stop = threading.Event()
+# Wakes up the main thread of run(), on a stop or once all worker threads have exited
+_wakeup = threading.Event()
 DAEMON_NAME = 'undertaker'
 
 
@@ -113,6 +115,7 @@ def stop(signum: "Optional[int]" = None, frame: "Optional[FrameType]" = None) ->
     Graceful exit.
     """
     graceful_stop.set()
+    _wakeup.set()
 
 
 def run(once: bool = False, total_workers: int = 1, chunk_size: int = 10, sleep_time: int = 60) -> None:
@@ -128,11 +131,26 @@ def run(once: bool = False, total_workers: int = 1, chunk_size: int = 10, sleep_
         undertaker(once)
     else:
         logging.info('main: starting threads')
-        threads = [threading.Thread(target=undertaker, kwargs={'once': once, 'chunk_size': chunk_size,
-                                                               'sleep_time': sleep_time}) for i in range(0, total_workers)]
+        running = total_workers
+        running_lock = threading.Lock()
+
+        def worker() -> None:
+            nonlocal running
+            try:
+                undertaker(once=once, chunk_size=chunk_size, sleep_time=sleep_time)
+            finally:
+                # Only the last worker to exit wakes up the main thread, the others keep running
+                with running_lock:
+                    running -= 1
+                    if not running:
+                        _wakeup.set()
+
+        _wakeup.clear()
+        threads = [threading.Thread(target=worker) for i in range(0, total_workers)]
         [t.start() for t in threads]
         logging.info('main: waiting for interrupts')
 
-        # Interruptible joins require a timeout.
-        while threads[0].is_alive():
-            [t.join(timeout=3.14) for t in threads]
+        # Event.wait() is interruptible by signals, the stop handler or the last exiting worker sets the event.
+        _wakeup.wait()
+        for t in threads:
+            t.join()
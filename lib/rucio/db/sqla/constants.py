@@ -29,6 +29,7 @@ PSQL_LOCK_NOT_AVAILABLE_REGEX = r".*55P03.*"
 PSQL_PSYCOPG_LOCK_NOT_AVAILABLE_REGEX = r".*psycopg.errors.LockNotAvailable.*"
 MYSQL_LOCK_NOWAIT_REGEX = r".*3572.*"
 MYSQL_LOCK_WAIT_TIMEOUT_EXCEEDED = "ERROR 1205 (HY000)"
+UNIQUE_CONSTRAINT_VIOLATED_REGEX = r"ORA-00001|UNIQUE constraint failed|1062.*Duplicate entry|duplicate key value violates unique constraint|columns? .*not unique"
 
 
 # The enum values below are the actual strings stored in the database -- these must be string types.
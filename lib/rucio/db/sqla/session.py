@@ -30,7 +30,7 @@ from sqlalchemy.exc import DatabaseError, DisconnectionError, OperationalError,
 from sqlalchemy.orm import DeclarativeBase, Session, scoped_session, sessionmaker
 from sqlalchemy.pool import NullPool, Pool, QueuePool, SingletonThreadPool
 
-from rucio.common.config import config_get
+from rucio.common.config import config_get, config_get_bool
 from rucio.common.exception import DatabaseException, InputValidationError, RucioException
 from rucio.common.extra import import_extras
 from rucio.common.utils import retrying
@@ -230,6 +230,12 @@ def get_engine() -> 'Engine':
                 params[param] = param_type(config_get(DATABASE_SECTION, param, check_config_table=False))
             except Exception:
                 pass
+        # Opt-in only: pool_use_lifo is rejected by pool classes other than QueuePool.
+        for param in ('pool_pre_ping', 'pool_use_lifo'):
+            try:
+                params[param] = config_get_bool(DATABASE_SECTION, param, check_config_table=False)
+            except Exception:
+                pass
         _ENGINE = create_engine(sql_connection, **params)
         if 'mysql' in sql_connection:
             event.listen(_ENGINE, 'checkout', mysql_ping_listener)
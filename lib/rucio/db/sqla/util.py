@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import logging
+import re
 from datetime import datetime
 from hashlib import sha256
 from os import urandom
@@ -38,7 +39,7 @@ from rucio.common.schema import get_schema_value
 from rucio.common.types import InternalAccount, LoggerFunction
 from rucio.common.utils import generate_uuid
 from rucio.db.sqla import models
-from rucio.db.sqla.constants import AccountStatus, AccountType, IdentityType
+from rucio.db.sqla.constants import UNIQUE_CONSTRAINT_VIOLATED_REGEX, AccountStatus, AccountType, IdentityType
 from rucio.db.sqla.session import get_dump_engine, get_engine, get_session
 from rucio.db.sqla.types import InternalScopeString, String
 
@@ -326,6 +327,33 @@ def json_implemented(*, session: Optional["Session"] = None) -> bool:
     return True
 
 
+_UNIQUE_CONSTRAINT_VIOLATED = re.compile(UNIQUE_CONSTRAINT_VIOLATED_REGEX)
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    """
+    Checks if an IntegrityError was raised because of a unique or primary key constraint violation.
+
+    The DB-API error code is used when the driver exposes one (PostgreSQL SQLSTATE, MySQL error number,
+    Oracle error code), which does not depend on the server locale. Otherwise, the error message is matched.
+
+    :param error: The IntegrityError raised by SQLAlchemy.
+    :returns: True, if a unique constraint was violated, False otherwise.
+    """
+    orig = error.orig
+    sqlstate = getattr(orig, 'sqlstate', None) or getattr(orig, 'pgcode', None)
+    if sqlstate:
+        return sqlstate == '23505'
+    args = getattr(orig, 'args', None)
+    if args:
+        if isinstance(args[0], int):
+            return args[0] == 1062
+        code = getattr(args[0], 'code', None)
+        if isinstance(code, int):
+            return code == 1
+    return _UNIQUE_CONSTRAINT_VIOLATED.search(str(error)) is not None
+
+
 def try_drop_constraint(constraint_name: str, table_name: str) -> None:
     """
     Tries to drop the given constrained and returns successfully if the
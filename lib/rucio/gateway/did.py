@@ -138,7 +138,6 @@ def add_did(
                 if k not in meta:
                     meta[k] = extra_meta[k]
                 elif meta[k] != extra_meta[k]:
-                    print("Provided metadata %s doesn't match the naming convention: %s != %s" % (k, meta[k], extra_meta[k]))
                     raise InvalidObject("Provided metadata %s doesn't match the naming convention: %s != %s" % (k, meta[k], extra_meta[k]))
 
             # Validate metadata
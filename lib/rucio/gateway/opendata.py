@@ -13,52 +13,79 @@
 # limitations under the License.
 
 import json
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from rucio.common.constants import DEFAULT_VO
-from rucio.common.types import InternalScope
+from rucio.common.extra import import_extras
+from rucio.common.types import get_internal_scope
 from rucio.common.utils import gateway_update_return_dict
 from rucio.core import opendata
-from rucio.core.opendata import opendata_state_str_to_enum, validate_opendata_did_state
-from rucio.db.sqla.constants import DatabaseOperationType
+from rucio.core.opendata import opendata_state_str_to_enum
+from rucio.db.sqla.constants import DatabaseOperationType, OpenDataDIDState
 from rucio.db.sqla.session import db_session
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from rucio.common.constants import OPENDATA_DID_STATE_LITERAL
 
+EXTRA_MODULES = import_extras(['orjson'])
+
+if EXTRA_MODULES['orjson']:
+    from orjson import loads as orjson_loads
+
+    def _json_loads(data: 'Union[str, bytes, bytearray]') -> Any:
+        return orjson_loads(data)
+else:
+    def _json_loads(data: 'Union[str, bytes, bytearray]') -> Any:
+        return json.loads(data)
+
 
 def list_opendata_dids(
         *,
         limit: Optional[int] = None,
         offset: Optional[int] = None,
-        state: Optional["OPENDATA_DID_STATE_LITERAL"] = None,
-) -> dict[str, list[dict[str, Any]]]:
+        after_scope: Optional[str] = None,
+        after_name: Optional[str] = None,
+        state: Optional[Union["OPENDATA_DID_STATE_LITERAL", OpenDataDIDState]] = None,
+        vo: str = DEFAULT_VO,
+) -> "Iterator[dict[str, Any]]":
     """
     List Opendata DIDs from the Opendata catalog.
 
     Parameters:
         limit: Maximum number of DIDs to return.
-        offset: Number of DIDs to skip before starting to collect the result set.
-        state: Filter DIDs by their state.
+        offset: Number of DIDs to skip before starting to collect the result set. Deprecated in favour of `after_scope` and `after_name`.
+        after_scope: Only return DIDs after this scope (in combination with `after_name`).
+        after_name: Only return DIDs after this name (in combination with `after_scope`).
+        state: Filter DIDs by their state, either as an OpenDataDIDState or its name.
+        vo: The virtual organization.
 
     Returns:
-        A dictionary with a list of DIDs matching the criteria.
+        An iterator over the DIDs matching the criteria.
     """
 
-    state_enum = None
-    if state is not None:
-        state = validate_opendata_did_state(state)
-        state_enum = opendata_state_str_to_enum(state)
+    internal_after_scope = get_internal_scope(after_scope, vo=vo) if after_scope is not None else None
+    state_enum = opendata_state_str_to_enum(state) if isinstance(state, str) else state
     with db_session(DatabaseOperationType.READ) as session:
-        result = opendata.list_opendata_dids(limit=limit, offset=offset, state=state_enum, session=session)
-    return result
+        result = opendata.stream_opendata_dids(limit=limit,
+                                               offset=offset,
+                                               after_scope=internal_after_scope,
+                                               after_name=after_name,
+                                               state=state_enum,
+                                               session=session)
+        # Rows are fresh dicts without RSE or account columns: rewrite the scope in place
+        # instead of copying every row through gateway_update_return_dict
+        for did in result:
+            did["scope"] = did["scope"].external
+            yield did
 
 
 def get_opendata_did(
         *,
         scope: str,
         name: str,
-        state: Optional["OPENDATA_DID_STATE_LITERAL"] = None,
+        state: Optional[Union["OPENDATA_DID_STATE_LITERAL", OpenDataDIDState]] = None,
         include_files: bool = True,
         include_metadata: bool = False,
         include_doi: bool = True,
@@ -71,7 +98,7 @@ def get_opendata_did(
     Parameters:
         scope: The scope of the DID.
         name: The name of the DID.
-        state: Optional state to filter the DID.
+        state: Optional state to filter the DID, either as an OpenDataDIDState or its name.
         include_files: Whether to include files in the result.
         include_metadata: Whether to include metadata in the result.
         include_doi: Whether to include DOI information in the result.
@@ -82,11 +109,8 @@ def get_opendata_did(
         A dictionary containing the details of the requested DID.
     """
 
-    internal_scope = InternalScope(scope, vo=vo)
-    state_enum = None
-    if state is not None:
-        state = validate_opendata_did_state(state)
-        state_enum = opendata_state_str_to_enum(state)
+    internal_scope = get_internal_scope(scope, vo=vo)
+    state_enum = opendata_state_str_to_enum(state) if isinstance(state, str) else state
 
     with db_session(DatabaseOperationType.READ) as session:
         result = opendata.get_opendata_did(scope=internal_scope,
@@ -97,7 +121,8 @@ def get_opendata_did(
                                            include_doi=include_doi,
                                            include_record_id=include_record_id,
                                            session=session)
-        return gateway_update_return_dict(result, session=session)
+    # The result carries no RSE ids, so translating it does not need the session
+    return gateway_update_return_dict(result)
 
 
 def add_opendata_did(
@@ -118,7 +143,7 @@ def add_opendata_did(
         None
     """
 
-    internal_scope = InternalScope(scope, vo=vo)
+    internal_scope = get_internal_scope(scope, vo=vo)
     with db_session(DatabaseOperationType.WRITE) as session:
         return opendata.add_opendata_did(scope=internal_scope, name=name, session=session)
 
@@ -141,7 +166,7 @@ def delete_opendata_did(
         None
     """
 
-    internal_scope = InternalScope(scope, vo=vo)
+    internal_scope = get_internal_scope(scope, vo=vo)
     with db_session(DatabaseOperationType.WRITE) as session:
         return opendata.delete_opendata_did(scope=internal_scope, name=name, session=session)
 
@@ -175,14 +200,13 @@ def update_opendata_did(
         ValueError: If meta is a string and cannot be parsed as valid JSON.
     """
 
-    internal_scope = InternalScope(scope, vo=vo)
+    internal_scope = get_internal_scope(scope, vo=vo)
     state_enum = None
     if state is not None:
-        state = validate_opendata_did_state(state)
         state_enum = opendata_state_str_to_enum(state)
-    if isinstance(meta, str):
+    if isinstance(meta, (str, bytes, bytearray)):
         try:
-            meta = json.loads(meta)
+            meta = _json_loads(meta)
         except ValueError as error:
             raise ValueError(f"Invalid JSON: {error}")
 
@@ -16,7 +16,7 @@ from typing import TYPE_CHECKING, Any, Optional
 
 from rucio.common import exception
 from rucio.common.constants import DEFAULT_VO
-from rucio.common.types import InternalScope
+from rucio.common.types import get_internal_scope
 from rucio.core.quarantined_replica import add_quarantined_replicas
 from rucio.core.rse import get_rse_id
 from rucio.db.sqla.constants import DatabaseOperationType
@@ -44,6 +44,7 @@ def quarantine_file_replicas(
     :param rse_id: RSE id - either RSE name or RSE id must be specified
     """
 
+    replicas = list(replicas)
     if not replicas:
         return
 
@@ -65,7 +66,8 @@ def quarantine_file_replicas(
                 raise exception.InputValidationError("Replica info must include path")
             scope = r.get("scope")
             if scope and isinstance(scope, str):
-                scope = InternalScope(scope, vo=vo)
+                # Cached, replicas of a request usually share a handful of scopes
+                scope = get_internal_scope(scope, vo=vo)
             replica_infos.append(
                 {
                     "scope": scope or None,
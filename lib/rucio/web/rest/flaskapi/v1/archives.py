@@ -13,11 +13,12 @@
 # limitations under the License.
 
 from json import dumps
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Union
 
 from flask import Flask, Response, request
 
 from rucio.common.constants import DEFAULT_VO, HTTPMethod
+from rucio.common.extra import import_extras
 from rucio.gateway.did import list_archive_content
 from rucio.web.rest.flaskapi.authenticated_bp import AuthenticatedBlueprint
 from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_accept_header_wrapper_flask, generate_http_error_flask, parse_scope_name, response_headers, try_stream
@@ -25,6 +26,18 @@ from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_acc
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+EXTRA_MODULES = import_extras(['orjson'])
+
+if EXTRA_MODULES['orjson']:
+    from orjson import OPT_APPEND_NEWLINE
+    from orjson import dumps as orjson_dumps
+
+    def _json_line(obj: 'dict[str, Any]') -> 'Union[str, bytes]':
+        return orjson_dumps(obj, option=OPT_APPEND_NEWLINE)
+else:
+    def _json_line(obj: 'dict[str, Any]') -> 'Union[str, bytes]':
+        return dumps(obj) + '\n'
+
 
 class Archive(ErrorHandlingMethodView):
     """ REST APIs for archive. """
@@ -77,9 +90,9 @@ class Archive(ErrorHandlingMethodView):
         try:
             scope, name = parse_scope_name(scope_name, request.environ.get('vo'))
 
-            def generate(vo: str) -> 'Iterator[str]':
+            def generate(vo: str) -> 'Iterator[Union[str, bytes]]':
                 for file in list_archive_content(scope=scope, name=name, vo=vo):
-                    yield dumps(file) + '\n'
+                    yield _json_line(file)
 
             return try_stream(generate(vo=request.environ.get('vo', DEFAULT_VO)))
         except ValueError as error:
@@ -18,7 +18,7 @@ import logging
 import os
 import re
 from configparser import NoOptionError, NoSectionError
-from functools import wraps
+from functools import cache, lru_cache, wraps
 from time import time
 from typing import TYPE_CHECKING, Any, Literal, Optional, TypeVar, Union, cast
 from urllib.parse import unquote_plus
@@ -93,6 +93,10 @@ class ErrorHandlingMethodView(MethodView):
     Exceptions for all defined methods automatically.
     """
 
+    # Views keep no per-request state on the instance, so a single instance
+    # created by as_view() can serve every request.
+    init_every_request = False
+
     def get_headers(self) -> Optional['HeadersType']:
         """Can be overridden to add headers to generic error responses."""
         return None
@@ -171,16 +175,27 @@ def request_auth_env() -> Optional['ResponseReturnValue']:
     flask.request.environ['start_time'] = time()
 
 
+# Headers that do not depend on the request, set on every response
+_STATIC_RESPONSE_HEADERS = {
+    'Access-Control-Allow-Methods': '*',
+    'Access-Control-Allow-Credentials': 'true',
+}
+_GET_NO_CACHE_HEADERS = {
+    'Cache-Control': 'post-check=0, pre-check=0',
+    'Pragma': 'no-cache',
+}
+
+
 def response_headers(response: ResponseTypeVar) -> ResponseTypeVar:
-    response.headers['Access-Control-Allow-Origin'] = flask.request.environ.get('HTTP_ORIGIN')  # type: ignore (value could be None)
-    response.headers['Access-Control-Allow-Headers'] = flask.request.environ.get('HTTP_ACCESS_CONTROL_REQUEST_HEADERS')  # type: ignore (value could be None)
-    response.headers['Access-Control-Allow-Methods'] = '*'
-    response.headers['Access-Control-Allow-Credentials'] = 'true'
+    environ = flask.request.environ
+    headers = response.headers
+    headers['Access-Control-Allow-Origin'] = environ.get('HTTP_ORIGIN')  # type: ignore (value could be None)
+    headers['Access-Control-Allow-Headers'] = environ.get('HTTP_ACCESS_CONTROL_REQUEST_HEADERS')  # type: ignore (value could be None)
+    headers.update(_STATIC_RESPONSE_HEADERS)
 
-    if flask.request.environ.get('REQUEST_METHOD') == HTTPMethod.GET.value:
-        response.headers['Cache-Control'] = 'no-cache, no-store, max-age=0, must-revalidate'
-        response.headers['Cache-Control'] = 'post-check=0, pre-check=0'
-        response.headers['Pragma'] = 'no-cache'
+    # Views may define their own caching policy for GET responses
+    if environ.get('REQUEST_METHOD') == HTTPMethod.GET.value and 'Cache-Control' not in headers:
+        headers.update(_GET_NO_CACHE_HEADERS)
 
     return response
 
@@ -194,6 +209,9 @@ def check_accept_header_wrapper_flask(
 ) -> 'Callable[[Callable[P, R]], Callable[P, R]]':
     """Decorator that refuses requests with an unsupported *Accept* header."""
 
+    # materialise once, so that any iterable can be checked on every request
+    supported_content_types = tuple(supported_content_types)
+
     def wrapper(
             f: 'Callable[P, R]'
     ) -> 'Callable[P, R]':
@@ -203,12 +221,14 @@ def check_accept_header_wrapper_flask(
         def decorated(*args: 'P.args', **kwargs: 'P.kwargs') -> 'R':
             """Run the header check, then delegate to *f* (or return 406)."""
 
+            accept_mimetypes = flask.request.accept_mimetypes
+
             # 1. no Accept header → accept everything
-            if not flask.request.accept_mimetypes.provided:
+            if not accept_mimetypes.provided:
                 return f(*args, **kwargs)
 
             # 2. at least one acceptable media‑type → call the view
-            if any(s in flask.request.accept_mimetypes for s in supported_content_types):
+            if any(s in accept_mimetypes for s in supported_content_types):
                 return f(*args, **kwargs)
 
             # 3. none matched → 406 response
@@ -230,6 +250,26 @@ def check_accept_header_wrapper_flask(
     return wrapper
 
 
+def _unquote_name(name: str) -> str:
+    """
+    unquote_plus, skipping the percent-decoding pass for names without any '%'.
+    """
+    if '%' in name:
+        return unquote_plus(name)
+    if '+' in name:
+        return name.replace('+', ' ')
+    return name
+
+
+@lru_cache(maxsize=32)
+def _compile_scope_name_regexp(pattern: str) -> 're.Pattern[str]':
+    """
+    Compiles a SCOPE_NAME_REGEXP once per pattern, instead of going through
+    the re module cache on every request.
+    """
+    return re.compile(pattern)
+
+
 def parse_scope_name(scope_name: str, vo: Optional[str]) -> tuple[str, ...]:
     """
     Parses the given scope_name according to the schema's
@@ -249,7 +289,7 @@ def parse_scope_name(scope_name: str, vo: Optional[str]) -> tuple[str, ...]:
             raise ValueError(f"Could not parse '{scope_name}' ({scope_name=}) with encoded '/' into scope and name.")
 
         scope, name = scope_name.split('/', 1)
-        name = unquote_plus(name)
+        name = _unquote_name(name)
 
         return scope, name
 
@@ -260,7 +300,7 @@ def parse_scope_name(scope_name: str, vo: Optional[str]) -> tuple[str, ...]:
     pattern = get_schema_value('SCOPE_NAME_REGEXP', vo)
     text = '/' + scope_name
 
-    scope_regex = re.match(pattern, text)
+    scope_regex = _compile_scope_name_regexp(pattern).match(text)
     if scope_regex is None:
         raise ValueError(f"Could not parse '{text}' ({scope_name=}) with pattern '{pattern}' into scope and name.")
 
@@ -268,6 +308,42 @@ def parse_scope_name(scope_name: str, vo: Optional[str]) -> tuple[str, ...]:
     return scope, name
 
 
+# SCOPE_NAME_REGEXPs that just split '/<scope>/<name>' at the first slash
+_SPLITTING_SCOPE_NAME_REGEXPS = frozenset((r"/([^/]+)/(.*)", '/(.*)/(.*)'))
+
+
+@cache
+def _scope_name_regexp_splits(vo: str) -> bool:
+    """
+    Whether the SCOPE_NAME_REGEXP of the vo's schema only splits at the slash.
+    Schemas are loaded once per vo, so the answer never changes.
+    """
+    return get_schema_value('SCOPE_NAME_REGEXP', vo) in _SPLITTING_SCOPE_NAME_REGEXPS
+
+
+def parse_scope_name_parts(scope: str, name: str, vo: Optional[str]) -> tuple[str, ...]:
+    """
+    Like parse_scope_name, but for a scope and name that were routed as
+    two separate path segments. When the schema's SCOPE_NAME_REGEXP only
+    splits at the slash, the parts are returned without rebuilding and
+    re-matching the joined string.
+
+    :param scope: the scope path segment.
+    :param name: the name path segment.
+    :param vo: the vo currently in use.
+    :raises ValueError: when scope and name could not be parsed.
+    :returns: a (scope, name) tuple.
+    """
+
+    if scope and '/' not in scope and '/' not in name:
+        if RUCIO_HTTPD_ENCODED_SLASHES_NO_DECODE:
+            return scope, _unquote_name(name)
+        if _scope_name_regexp_splits(vo or DEFAULT_VO):
+            return scope, name
+
+    return parse_scope_name(f"{scope}/{name}", vo)
+
+
 def try_stream(
         generator: 'SupportsIter',
         content_type: Optional[str] = None
@@ -12,15 +12,119 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
+import json
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Optional
+
 from flask import Blueprint, Flask, Response, request
+from werkzeug.http import generate_etag
 
 from rucio.common.constants import DEFAULT_VO, HTTPMethod
-from rucio.common.exception import AccessDenied, DataIdentifierNotFound, OpenDataDataIdentifierAlreadyExists, OpenDataDataIdentifierNotFound
-from rucio.common.utils import render_json
-from rucio.core.opendata import validate_opendata_did_state
+from rucio.common.exception import AccessDenied, DataIdentifierNotFound, InputValidationError, OpenDataDataIdentifierAlreadyExists, OpenDataDataIdentifierNotFound
+from rucio.common.extra import import_extras
+from rucio.common.utils import APIEncoder, render_json
+from rucio.core.opendata import opendata_state_str_to_enum
+from rucio.db.sqla.constants import OpenDataDIDState
 from rucio.gateway import opendata
 from rucio.web.rest.flaskapi.authenticated_bp import AuthenticatedBlueprint
-from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_accept_header_wrapper_flask, generate_http_error_flask, json_parameters, param_get, parse_scope_name, response_headers
+from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_accept_header_wrapper_flask, generate_http_error_flask, json_parameters, param_get, parse_scope_name_parts, response_headers, try_stream
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from werkzeug.datastructures import MultiDict
+
+# Upper bound for the page size of the Open Data DID listings
+MAX_LIST_LIMIT = 1000
+# Upper bound for the deprecated offset pagination; use the 'after' cursor instead
+MAX_LIST_OFFSET = 10_000_000
+# Fields of the files summary that describe the request rather than the DID
+_VOLATILE_FILES_SUMMARY_KEYS = frozenset(("request_cache_hit", "request_time_elapsed_millis"))
+
+EXTRA_MODULES = import_extras(['orjson'])
+
+if EXTRA_MODULES['orjson']:
+    from orjson import OPT_PASSTHROUGH_DATETIME
+    from orjson import dumps as orjson_dumps
+
+    _api_default = APIEncoder().default
+
+    def _encode_did(did: "dict[str, Any]") -> str:
+        # orjson serialises Enum members by value, while the API exposes their name
+        did = {key: value.name if isinstance(value, Enum) else value for key, value in did.items()}
+        return orjson_dumps(did, default=_api_default, option=OPT_PASSTHROUGH_DATETIME).decode()
+else:
+    def _encode_did(did: "dict[str, Any]") -> str:
+        return render_json(**did)
+
+
+def _etag(result: "dict[str, Any]") -> str:
+    """
+    ETag of an Open Data DID, left unchanged by the per-request fields of the files summary.
+    """
+    files_summary = result.get("files_summary")
+    if files_summary is not None:
+        result = {**result, "files_summary": {key: value for key, value in files_summary.items() if key not in _VOLATILE_FILES_SUMMARY_KEYS}}
+    return generate_etag(render_json(**result).encode())
+
+
+def _non_negative_int_arg(args: "MultiDict[str, str]", name: str) -> Optional[int]:
+    """
+    Read an optional non-negative integer query parameter.
+    """
+    value = args.get(name)
+    if value is None:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise InputValidationError(f"Query parameter '{name}' must be an integer, got '{value}'.")
+    if number < 0:
+        raise InputValidationError(f"Query parameter '{name}' must not be negative, got {number}.")
+    return number
+
+
+def _encode_cursor(scope: str, name: str) -> str:
+    """
+    Encode the DID of the last entry of a page into an opaque pagination cursor.
+    """
+    return base64.urlsafe_b64encode(f"{scope}:{name}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    """
+    Decode a pagination cursor created by `_encode_cursor` into a scope and name.
+    """
+    try:
+        scope, separator, name = base64.urlsafe_b64decode(cursor.encode()).decode().partition(":")
+    except (ValueError, UnicodeError):
+        raise InputValidationError(f"Invalid pagination cursor '{cursor}'.")
+    if not separator or not scope or not name:
+        raise InputValidationError(f"Invalid pagination cursor '{cursor}'.")
+    return scope, name
+
+
+def _stream_dids(dids: "Iterable[dict[str, Any]]", *, limit: Optional[int], offset: Optional[int]) -> "Iterator[str]":
+    """
+    Stream a listing of Open Data DIDs as a single JSON object, one DID at a time.
+    The first DID is fetched before anything is yielded, so that errors raised by
+    the listing are reported by `try_stream` instead of in the middle of the body.
+    """
+    it = iter(dids)
+    did = next(it, None)
+    yield '{"dids": ['
+    total = 0
+    last = None
+    while did is not None:
+        yield (', ' if total else '') + _encode_did(did)
+        total += 1
+        last = did
+        did = next(it, None)
+    next_cursor = None
+    if limit is not None and last is not None and total == limit:
+        next_cursor = _encode_cursor(last["scope"], last["name"])
+    yield '], "total": %d, "offset": %d, "next_cursor": %s}' % (total, offset or 0, json.dumps(next_cursor))
 
 
 class OpenDataView(ErrorHandlingMethodView):
@@ -30,15 +134,27 @@ class OpenDataView(ErrorHandlingMethodView):
         Helper function to list Open Data DIDs. To be used by both authenticated and unauthenticated views.
         """
         try:
-            state = request.args.get("state", default=None) if not public else "PUBLIC"
-            if state is not None:
-                state = validate_opendata_did_state(state)
-
-            limit = request.args.get("limit", default=None, type=int)  # type: ignore
-            offset = request.args.get("offset", default=None, type=int)  # type: ignore
-            result = opendata.list_opendata_dids(limit=limit, offset=offset, state=state)
-            result = render_json(**result)
-            return Response(result, status=200, mimetype='application/json')
+            args = request.args
+            state = args.get("state", default=None) if not public else OpenDataDIDState.PUBLIC
+            if isinstance(state, str):
+                state = opendata_state_str_to_enum(state)
+
+            vo = request.environ.get("vo", DEFAULT_VO) if not public else DEFAULT_VO
+            limit = _non_negative_int_arg(args, "limit")
+            if limit is not None:
+                limit = min(limit, MAX_LIST_LIMIT)
+            offset = _non_negative_int_arg(args, "offset")
+            if offset is not None and offset > MAX_LIST_OFFSET:
+                raise InputValidationError(f"Query parameter 'offset' must not exceed {MAX_LIST_OFFSET}, use the 'after' cursor instead.")
+            after = args.get("after", default=None)
+            after_scope, after_name = _decode_cursor(after) if after else (None, None)
+            dids = opendata.list_opendata_dids(limit=limit,
+                                               offset=offset,
+                                               after_scope=after_scope,
+                                               after_name=after_name,
+                                               state=state,
+                                               vo=vo)
+            return try_stream(_stream_dids(dids, limit=limit, offset=offset), content_type='application/json')
         except AccessDenied as error:
             return generate_http_error_flask(401, error)
         except Exception as error:
@@ -55,18 +171,25 @@ class OpenDataView(ErrorHandlingMethodView):
         parameters:
           - name: limit
             in: query
-            description: "Maximum number of results to return."
+            description: "Maximum number of results to return, capped at 1000."
             schema:
               type: integer
             required: false
             style: form
           - name: offset
             in: query
-            description: "Number of items to skip before starting to collect the result set."
+            description: "Number of items to skip before starting to collect the result set. Deprecated, use 'after' instead."
             schema:
               type: integer
             required: false
             style: form
+          - name: after
+            in: query
+            description: "Pagination cursor returned as 'next_cursor' by the previous page."
+            schema:
+              type: string
+            required: false
+            style: form
           - name: state
             in: query
             description: "Filter DIDs by their state (e.g., 'PUBLIC')."
@@ -97,16 +220,17 @@ class OpenDataDIDsView(ErrorHandlingMethodView):
         Helper function to get Open Data DID information. To be used by both authenticated and unauthenticated views.
         """
         try:
+            args = request.args
             vo = request.environ.get("vo", DEFAULT_VO) if not public else DEFAULT_VO
-            state = request.args.get("state", default=None) if not public else "public"
-            if state is not None:
-                state = validate_opendata_did_state(state)
-
-            scope, name = parse_scope_name(f"{scope}/{name}", vo=vo)
-            include_files = request.args.get("files", default="0").lower() == "1"
-            include_metadata = request.args.get("meta", default="0").lower() == "1"
-            include_doi = request.args.get("doi", default="1").lower() == "1"
-            include_record_id = request.args.get("record_id", default="1").lower() == "1"
+            state = args.get("state", default=None) if not public else OpenDataDIDState.PUBLIC
+            if isinstance(state, str):
+                state = opendata_state_str_to_enum(state)
+
+            scope, name = parse_scope_name_parts(scope, name, vo=vo)
+            include_files = args.get("files", default="0").lower() == "1"
+            include_metadata = args.get("meta", default="0").lower() == "1"
+            include_doi = args.get("doi", default="1").lower() == "1"
+            include_record_id = args.get("record_id", default="1").lower() == "1"
             result = opendata.get_opendata_did(scope=scope, name=name, vo=vo,
                                                state=state,
                                                include_files=include_files,
@@ -115,8 +239,15 @@ class OpenDataDIDsView(ErrorHandlingMethodView):
                                                include_record_id=include_record_id,
                                                )
 
-            result = render_json(**result)
-            return Response(result, status=200, mimetype='application/json')
+            response = Response(render_json(**result), status=200, mimetype='application/json')
+            if public:
+                # Public DIDs are served without authentication: let clients and proxies keep a copy,
+                # revalidated through the ETag, and answer unchanged re-requests with 304 Not Modified
+                response.cache_control.public = True
+                response.cache_control.no_cache = True
+                response.set_etag(_etag(result))
+                response.make_conditional(request)
+            return response
         except AccessDenied as error:
             return generate_http_error_flask(401, error)
         except OpenDataDataIdentifierNotFound as error:
@@ -243,7 +374,7 @@ class OpenDataDIDsView(ErrorHandlingMethodView):
         """
         vo = request.environ.get("vo", DEFAULT_VO)
         try:
-            scope, name = parse_scope_name(f"{scope}/{name}", vo=vo)
+            scope, name = parse_scope_name_parts(scope, name, vo=vo)
             opendata.add_opendata_did(scope=scope, name=name, vo=vo)
         except AccessDenied as error:
             return generate_http_error_flask(401, error)
@@ -317,8 +448,9 @@ class OpenDataDIDsView(ErrorHandlingMethodView):
           404:
             description: "Data Identifier not found."
         """
+        vo = request.environ.get("vo", DEFAULT_VO)
         try:
-            scope, name = parse_scope_name(f"{scope}/{name}", request.environ.get("vo", DEFAULT_VO))
+            scope, name = parse_scope_name_parts(scope, name, vo=vo)
             parameters = json_parameters()
             state = param_get(parameters, 'state', default=None)
             meta = param_get(parameters, 'meta', default=None)
@@ -333,7 +465,7 @@ class OpenDataDIDsView(ErrorHandlingMethodView):
                 meta=meta,
                 doi=doi,
                 record_id=record_id,
-                vo=request.environ.get("vo", DEFAULT_VO),
+                vo=vo,
             )
         except AccessDenied as error:
             return generate_http_error_flask(401, error)
@@ -376,9 +508,10 @@ class OpenDataDIDsView(ErrorHandlingMethodView):
           404:
             description: "Data Identifier not found."
         """
+        vo = request.environ.get("vo", DEFAULT_VO)
         try:
-            scope, name = parse_scope_name(f"{scope}/{name}", request.environ.get("vo", DEFAULT_VO))
-            opendata.delete_opendata_did(scope=scope, name=name, vo=request.environ.get("vo", DEFAULT_VO))
+            scope, name = parse_scope_name_parts(scope, name, vo=vo)
+            opendata.delete_opendata_did(scope=scope, name=name, vo=vo)
         except AccessDenied as error:
             return generate_http_error_flask(401, error)
         except OpenDataDataIdentifierNotFound as error:
@@ -32,18 +32,25 @@ class OpenDataPublicView(ErrorHandlingMethodView):
         parameters:
           - name: limit
             in: query
-            description: "Maximum number of results to return."
+            description: "Maximum number of results to return, capped at 1000."
             schema:
               type: integer
             required: false
             style: form
           - name: offset
             in: query
-            description: "Number of items to skip before starting to collect the result set."
+            description: "Number of items to skip before starting to collect the result set. Deprecated, use 'after' instead."
             schema:
               type: integer
             required: false
             style: form
+          - name: after
+            in: query
+            description: "Pagination cursor returned as 'next_cursor' by the previous page."
+            schema:
+              type: string
+            required: false
+            style: form
         responses:
           200:
             description: "Successful retrieval of the list of Open Data DIDs."
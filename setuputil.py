@@ -106,6 +106,7 @@ server_requirements_table = {
             'globus-sdk<=4.1.0',
         ],
         'saml': ['python3-saml<=1.16.0'],
+        'orjson': ['orjson<=3.11.4'],
         'dev': dev_requirements
     }
 }
@@ -15,7 +15,7 @@
 import pytest
 
 from rucio.common.constants import DEFAULT_VO
-from rucio.common.types import InternalAccount, InternalScope, InternalType, _RepresentationCalculator
+from rucio.common.types import InternalAccount, InternalScope, InternalType, _RepresentationCalculator, get_internal_scope
 
 
 class TestInternalType:
@@ -149,3 +149,10 @@ class TestInternalScope:
         internal_scope = InternalScope(scope=input_scope, from_external=input_from_external)
         assert internal_scope.external == expected_external
         assert internal_scope.internal == expected_internal
+
+    def test_get_internal_scope(self):
+        internal_scope = get_internal_scope('test', vo='test_vo')
+        assert internal_scope == InternalScope('test', vo='test_vo')
+        assert internal_scope.internal == 'test@test_vo'
+        assert get_internal_scope('test', vo='test_vo') is internal_scope
+        assert get_internal_scope('test') is not internal_scope
@@ -16,9 +16,11 @@ from unittest.mock import patch
 
 import pytest
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 
 from rucio.common.exception import InputValidationError
 from rucio.db.sqla.session import NullPool, QueuePool, SingletonThreadPool, _get_engine_poolclass, get_session
+from rucio.db.sqla.util import is_unique_violation
 
 
 def test_db_connection():
@@ -40,6 +42,26 @@ def test_config_poolclass():
         _get_engine_poolclass('unknown')
 
 
+class _PsycopgError(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__('localized message')
+        self.sqlstate = sqlstate
+
+
+@pytest.mark.parametrize('orig, expected', [
+    (_PsycopgError('23505'), True),
+    (_PsycopgError('23503'), False),
+    (Exception(1062, "Duplicate entry 'x' for key 'PRIMARY'"), True),
+    (Exception(1452, 'Cannot add or update a child row'), False),
+    (Exception('UNIQUE constraint failed: scopes.scope'), True),
+    (Exception('FOREIGN KEY constraint failed'), False),
+])
+def test_is_unique_violation(orig, expected):
+    """ DB (CORE): Test detection of unique constraint violations """
+    error = IntegrityError('INSERT', {}, orig)
+    assert is_unique_violation(error) is expected
+
+
 @pytest.mark.noparallel(reason='Changes an internal method of MethodView.')
 def test_pooloverload():
     """ DB (WEB): Test response to a DatabaseException due to Pool Overflow """
@@ -12,22 +12,28 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
 import re
 from configparser import NoOptionError
 
 import pytest
+from click.testing import CliRunner
 
+from rucio.cli.opendata import opendata as opendata_cli
 from rucio.common.config import config_add_section, config_get, config_get_bool, config_has_section, config_remove_option, config_set
 from rucio.common.constants import OPENDATA_DID_STATE_LITERAL
 from rucio.common.exception import DataIdentifierNotFound, OpenDataDataIdentifierAlreadyExists, OpenDataDataIdentifierNotFound, OpenDataDuplicateDOI, OpenDataDuplicateRecordID, OpenDataInvalidStateUpdate
-from rucio.common.utils import execute
+from rucio.common.utils import execute, generate_uuid
 from rucio.core import opendata
-from rucio.core.did import add_did, set_status
+from rucio.core.did import add_did, add_dids, set_status
 from rucio.core.rse import add_rse_attribute
-from rucio.db.sqla.constants import DIDType, OpenDataDIDState
-from rucio.db.sqla.session import get_session
+from rucio.db.sqla.constants import DatabaseOperationType, DIDType, OpenDataDIDState
+from rucio.db.sqla.session import db_session, get_session
 from rucio.db.sqla.util import json_implemented
 from rucio.tests.common import auth, did_name_generator, headers
+from rucio.web.rest.flaskapi.v1.opendata import _encode_cursor
+
+DIALECT_NAME = get_session().bind.dialect.name
 
 skip_unsupported_json = pytest.mark.skipif(
     not json_implemented(),
@@ -35,12 +41,17 @@ skip_unsupported_json = pytest.mark.skipif(
 )
 
 skip_unsupported_dialect = pytest.mark.skipif(
-    get_session().bind.dialect.name in ['oracle', 'sqlite'],
-    reason=f"Unsupported dialect: {get_session().bind.dialect.name}"
+    DIALECT_NAME in ['oracle', 'sqlite'],
+    reason=f"Unsupported dialect: {DIALECT_NAME}"
 )
 
 OPENDATA_RSE_EXPRESSION = 'OpenData=True'
 
+# Sections and long options of the click help output
+SUBCOMMANDS_SECTION_REGEXP = re.compile(r"(?i)^Commands:\n((?:\s{2,}\w+.*\n)+)", re.MULTILINE)
+OPTIONS_SECTION_REGEXP = re.compile(r"(?i)^Options:\n((?:\s{2,}.+\n)+)", re.MULTILINE)
+LONG_OPTION_REGEXP = re.compile(r"--\w[\w-]*")
+
 
 @pytest.fixture(scope="module", autouse=True)
 def module_setup():
@@ -51,6 +62,28 @@ def module_setup():
     config_set('opendata', 'rse_expression', OPENDATA_RSE_EXPRESSION)
 
 
+@pytest.fixture(scope="module")
+def opendata_did_pool(mock_scope, root_account):
+    """
+    Iterator over Open Data DIDs in the DRAFT state, registered once per module.
+    Each test taking a DID with `next` gets one no other test has touched.
+    """
+    dids = [{"scope": mock_scope, "name": did_name_generator(did_type="dataset")} for _ in range(10)]
+    with db_session(DatabaseOperationType.WRITE) as session:
+        add_dids([{**did, "type": DIDType.DATASET} for did in dids], account=root_account, session=session)
+        opendata.add_opendata_dids(dids=dids, session=session)
+    return iter(dids)
+
+
+def close_and_publish(scope, name, *, session):
+    """
+    Close a DID and make it public in the Open Data catalog, in the given session.
+    Only closed DIDs can be published.
+    """
+    set_status(scope=scope, name=name, open=False, session=session)
+    return opendata.update_opendata_did(scope=scope, name=name, state=OpenDataDIDState.PUBLIC, session=session)
+
+
 class TestOpenDataCommon:
     def test_opendata_did_states(self):
         """
@@ -68,16 +101,12 @@ class TestOpenDataCommon:
         assert rse_expression == OPENDATA_RSE_EXPRESSION, f"'opendata.rse_expression' should be '{OPENDATA_RSE_EXPRESSION}'"
 
 
-@pytest.mark.noparallel(reason="Changes in configuration values and race conditions")
 class TestOpenDataCore:
     def test_opendata_dids_add(self, mock_scope, root_account, db_write_session):
-        dids = [
-            {"scope": mock_scope, "name": did_name_generator(did_type="dataset")} for _ in range(6)
-        ]
+        dids = [{"scope": mock_scope, "name": did_name_generator(did_type="dataset")} for _ in range(6)]
 
-        for did in dids[0:5]:
-            add_did(scope=did["scope"], name=did["name"], account=root_account, did_type=DIDType.DATASET,
-                    session=db_write_session)
+        add_dids([{**did, "type": DIDType.DATASET} for did in dids[0:5]], account=root_account,
+                 session=db_write_session)
 
         # Add to open data in bulk
         opendata.add_opendata_dids(dids=dids[0:4], session=db_write_session)
@@ -104,14 +133,8 @@ class TestOpenDataCore:
         with pytest.raises(OpenDataDataIdentifierAlreadyExists):
             opendata.add_opendata_did(scope=dids[0]["scope"], name=dids[0]["name"], session=db_write_session)
 
-    def test_opendata_dids_defaults(self, mock_scope, root_account, db_write_session):
-        name = did_name_generator(did_type="dataset")
-
-        add_did(scope=mock_scope, name=name, account=root_account, did_type=DIDType.DATASET, session=db_write_session)
-
-        opendata.add_opendata_did(scope=mock_scope, name=name, session=db_write_session)
-
-        db_write_session.commit()
+    def test_opendata_dids_defaults(self, mock_scope, opendata_did_pool, db_write_session):
+        name = next(opendata_did_pool)["name"]
 
         opendata_did = opendata.get_opendata_did(scope=mock_scope, name=name, session=db_write_session)
 
@@ -174,9 +197,7 @@ class TestOpenDataCore:
             opendata.update_opendata_did(scope=mock_scope, name=name, state=OpenDataDIDState.PUBLIC,
                                          session=db_write_session)
 
-        set_status(scope=mock_scope, name=name, open=False, session=db_write_session)
-        response = opendata.update_opendata_did(scope=mock_scope, name=name, state=OpenDataDIDState.PUBLIC,
-                                                session=db_write_session)
+        response = close_and_publish(mock_scope, name, session=db_write_session)
 
         db_write_session.commit()
 
@@ -213,14 +234,8 @@ class TestOpenDataCore:
         assert state == OpenDataDIDState.PUBLIC
 
     @skip_unsupported_dialect
-    def test_opendata_dids_meta_update(self, mock_scope, root_account, db_write_session):
-        name = did_name_generator(did_type="dataset")
-
-        add_did(scope=mock_scope, name=name, account=root_account, did_type=DIDType.DATASET,
-                session=db_write_session)
-        opendata.add_opendata_did(scope=mock_scope, name=name, session=db_write_session)
-
-        db_write_session.commit()
+    def test_opendata_dids_meta_update(self, mock_scope, opendata_did_pool, db_write_session):
+        name = next(opendata_did_pool)["name"]
 
         meta = opendata.get_opendata_meta(scope=mock_scope, name=name, session=db_write_session)
 
@@ -235,12 +250,8 @@ class TestOpenDataCore:
 
         assert meta == meta_new, "'meta' should be updated"
 
-    def test_opendata_doi_update(self, mock_scope, root_account, doi_factory, db_write_session):
-        name = did_name_generator(did_type="dataset")
-
-        add_did(scope=mock_scope, name=name, account=root_account, did_type=DIDType.DATASET,
-                session=db_write_session)
-        opendata.add_opendata_did(scope=mock_scope, name=name, session=db_write_session)
+    def test_opendata_doi_update(self, mock_scope, opendata_did_pool, doi_factory, db_write_session):
+        name = next(opendata_did_pool)["name"]
 
         doi = doi_factory()
 
@@ -352,29 +363,43 @@ class TestOpenDataCore:
                                          session=db_write_session)
 
     def test_opendata_dids_list(self, mock_scope, root_account, db_write_session):
-        dids = [
-            {"scope": mock_scope, "name": did_name_generator(did_type="dataset")} for _ in range(5)
-        ]
+        dids = [{"scope": mock_scope, "name": did_name_generator(did_type="dataset")} for _ in range(5)]
 
-        for did in dids:
-            add_did(scope=did["scope"], name=did["name"], account=root_account, did_type=DIDType.DATASET,
-                    session=db_write_session)
-            opendata.add_opendata_did(scope=did["scope"], name=did["name"], session=db_write_session)
+        add_dids([{**did, "type": DIDType.DATASET} for did in dids], account=root_account, session=db_write_session)
+        opendata.add_opendata_dids(dids=dids, session=db_write_session)
 
-        opendata_dids = opendata.list_opendata_dids(session=db_write_session)["dids"]
+        opendata_dids = {d["name"]: d for d in opendata.list_opendata_dids(session=db_write_session)["dids"]}
 
         for did in dids:
-            index = next(i for i, d in enumerate(opendata_dids) if d["name"] == did["name"])
-            assert opendata_dids[index]["scope"] == did["scope"], "Scope does not match"
-            assert opendata_dids[index]["name"] == did["name"], "Name does not match"
-            assert opendata_dids[index]["state"] == OpenDataDIDState.DRAFT, "State does not match"
+            did_output = opendata_dids[did["name"]]
+            assert did_output["scope"] == did["scope"], "Scope does not match"
+            assert did_output["name"] == did["name"], "Name does not match"
+            assert did_output["state"] == OpenDataDIDState.DRAFT, "State does not match"
+
+    def test_opendata_dids_list_keyset(self, mock_scope, root_account, db_write_session):
+        names = sorted(did_name_generator(did_type="dataset") for _ in range(3))
+
+        dids = [{"scope": mock_scope, "name": name} for name in names]
+        add_dids([{**did, "type": DIDType.DATASET} for did in dids], account=root_account, session=db_write_session)
+        opendata.add_opendata_dids(dids=dids, session=db_write_session)
+
+        opendata_dids = opendata.list_opendata_dids(after_scope=mock_scope, after_name=names[0],
+                                                    session=db_write_session)["dids"]
+        opendata_names = {d["name"] for d in opendata_dids if d["scope"] == mock_scope}
+
+        assert names[0] not in opendata_names, "DIDs up to the cursor should not be listed"
+        assert {names[1], names[2]} <= opendata_names, "DIDs after the cursor should be listed"
+
+        opendata_dids = opendata.list_opendata_dids(limit=1, after_scope=mock_scope, after_name=names[0],
+                                                    session=db_write_session)["dids"]
+        assert len(opendata_dids) == 1, "Limit should apply to the keyset page"
 
     def test_opendata_dids_list_public(self, mock_scope, root_account, db_write_session):
         did_private_name = did_name_generator(did_type="dataset")
         did_public_name = did_name_generator(did_type="dataset")
 
-        opendata_public_number_before = len(
-            opendata.list_opendata_dids(state=OpenDataDIDState.PUBLIC, session=db_write_session)["dids"])
+        opendata_public_before = {
+            d["name"] for d in opendata.list_opendata_dids(state=OpenDataDIDState.PUBLIC, session=db_write_session)["dids"]}
 
         add_did(scope=mock_scope, name=did_private_name, account=root_account, did_type=DIDType.DATASET,
                 session=db_write_session)
@@ -383,14 +408,15 @@ class TestOpenDataCore:
 
         opendata.add_opendata_did(scope=mock_scope, name=did_private_name, session=db_write_session)
         opendata.add_opendata_did(scope=mock_scope, name=did_public_name, session=db_write_session)
-        set_status(scope=mock_scope, name=did_public_name, open=False, session=db_write_session)
-        opendata.update_opendata_did(scope=mock_scope, name=did_public_name, state=OpenDataDIDState.PUBLIC,
-                                     session=db_write_session)
+        close_and_publish(mock_scope, did_public_name, session=db_write_session)
 
-        opendata_public_number_after = len(
-            opendata.list_opendata_dids(state=OpenDataDIDState.PUBLIC, session=db_write_session)["dids"])
+        opendata_public_after = {
+            d["name"] for d in opendata.list_opendata_dids(state=OpenDataDIDState.PUBLIC, session=db_write_session)["dids"]}
 
-        assert opendata_public_number_after - opendata_public_number_before == 1, "Public number should be 1 more"
+        # Compare names rather than counts, other tests may publish DIDs concurrently
+        opendata_public_new = opendata_public_after - opendata_public_before
+        assert did_public_name in opendata_public_new, "The published DID should be listed as public"
+        assert did_private_name not in opendata_public_new, "The draft DID should not be listed as public"
 
         db_write_session.commit()
 
@@ -401,6 +427,7 @@ class TestOpenDataCore:
         assert opendata_did_public_new["name"] == did_public_name, "Name does not match"
         assert opendata_did_public_new["state"] == OpenDataDIDState.PUBLIC, "State does not match"
 
+    @pytest.mark.noparallel(reason="Changes in configuration values")
     def test_opendata_dids_update_rule(self, mock_scope, root_account, vo, db_write_session, rse_factory):
         _, opendata_rse_id = rse_factory.make_posix_rse(session=db_write_session)
         add_rse_attribute(opendata_rse_id, key='OpenData', value=True, session=db_write_session)
@@ -412,9 +439,7 @@ class TestOpenDataCore:
 
         db_write_session.commit()
 
-        set_status(scope=mock_scope, name=name, open=False, session=db_write_session)
-        opendata.update_opendata_did(scope=mock_scope, name=name, state=OpenDataDIDState.PUBLIC,
-                                     session=db_write_session)
+        close_and_publish(mock_scope, name, session=db_write_session)
 
         db_write_session.commit()
 
@@ -465,6 +490,7 @@ class TestOpenDataCore:
             config_set('opendata', 'rse_expression', OPENDATA_RSE_EXPRESSION)
             config_set('opendata', 'rule_rse_expression', OPENDATA_RSE_EXPRESSION)
 
+    @pytest.mark.noparallel(reason="Changes in configuration values")
     def test_opendata_dids_show_files(self, mock_scope, root_account, db_write_session):
         name = did_name_generator(did_type="dataset")
         scope = mock_scope
@@ -504,56 +530,64 @@ class TestOpenDataCore:
             config_set('opendata', 'rse_expression', OPENDATA_RSE_EXPRESSION)
 
 
-@pytest.mark.noparallel(reason="Changes in configuration values and race conditions")
 class TestOpenDataClient:
     def test_opendata_dids_list_client(self, mock_scope, rucio_client):
         scope = str(mock_scope)
-        dids = [
-            {"scope": scope, "name": did_name_generator(did_type="dataset")} for _ in range(5)
-        ]
+        dids = [{"scope": scope, "name": did_name_generator(did_type="dataset")} for _ in range(5)]
         dids.sort(key=lambda x: x["name"])
 
+        rucio_client.add_dids([{**did, "type": "DATASET"} for did in dids])
         for did in dids:
-            rucio_client.add_did(scope=did["scope"], name=did["name"], did_type="DATASET")
             rucio_client.add_opendata_did(scope=did["scope"], name=did["name"])
 
-        opendata_dids = rucio_client.list_opendata_dids()["dids"]
+        opendata_dids = {d["name"]: d for d in rucio_client.list_opendata_dids()["dids"]}
 
         for did in dids:
-            did_output = next((d for d in opendata_dids if d["name"] == did["name"]), None)
+            did_output = opendata_dids.get(did["name"])
             assert did_output is not None, f"Did {did['name']} not found in opendata_dids"
             assert did_output["scope"] == str(did["scope"]), "Scope does not match"
             assert did_output["name"] == did["name"], "Name does not match"
             assert did_output["state"] == "DRAFT", "State does not match"
 
+    def test_opendata_dids_list_client_cursor(self, mock_scope, rucio_client):
+        scope = str(mock_scope)
+        dids = [{"scope": scope, "name": name} for name in sorted(did_name_generator(did_type="dataset") for _ in range(2))]
+
+        rucio_client.add_dids([{**did, "type": "DATASET"} for did in dids])
+        for did in dids:
+            rucio_client.add_opendata_did(scope=did["scope"], name=did["name"])
+
+        page = rucio_client.list_opendata_dids(limit=1, after=_encode_cursor(scope, dids[0]["name"]))
+        assert len(page["dids"]) == 1, "Limit should apply to the page"
+        assert page["dids"][0]["name"] != dids[0]["name"], "DIDs up to the cursor should not be listed"
+        assert page["next_cursor"] is not None, "A full page should come with a cursor"
+
+        next_page = rucio_client.list_opendata_dids(limit=1, after=page["next_cursor"])
+        assert page["dids"][0]["name"] not in {did["name"] for did in next_page["dids"]}, "The cursor should continue after the previous page"
+
     def test_opendata_dids_public_list_client(self, mock_scope, rucio_client):
         scope = str(mock_scope)
-        dids = [
-            {"scope": scope, "name": did_name_generator(did_type="dataset")} for _ in range(5)
-        ]
+        dids = [{"scope": scope, "name": did_name_generator(did_type="dataset")} for _ in range(5)]
         dids.sort(key=lambda x: x["name"])
 
-        opendata_dids_before = rucio_client.list_opendata_dids()["dids"]
+        opendata_dids_before = {(d["scope"], d["name"]) for d in rucio_client.list_opendata_dids()["dids"]}
 
+        rucio_client.add_dids([{**did, "type": "DATASET"} for did in dids])
         for did in dids:
-            rucio_client.add_did(scope=did["scope"], name=did["name"], did_type="DATASET")
             rucio_client.add_opendata_did(scope=did["scope"], name=did["name"])
 
-        # set number 2 and 3 to public
-        rucio_client.set_status(scope=dids[1]["scope"], name=dids[1]["name"], open=False)
-        rucio_client.update_opendata_did(scope=dids[1]["scope"], name=dids[1]["name"], state="public")
-
-        rucio_client.set_status(scope=dids[2]["scope"], name=dids[2]["name"], open=False)
-        rucio_client.update_opendata_did(scope=dids[2]["scope"], name=dids[2]["name"], state="public")
+        # set number 2, 3 and 4 to public
+        for did in dids[1:4]:
+            rucio_client.set_status(scope=did["scope"], name=did["name"], open=False)
+            rucio_client.update_opendata_did(scope=did["scope"], name=did["name"], state="public")
 
-        # set number 4 to public
-        rucio_client.set_status(scope=dids[3]["scope"], name=dids[3]["name"], open=False)
-        rucio_client.update_opendata_did(scope=dids[3]["scope"], name=dids[3]["name"], state="public")
-        # then suspend it
+        # then suspend number 4
         rucio_client.update_opendata_did(scope=dids[3]["scope"], name=dids[3]["name"], state="suspended")
 
+        # Only consider the DIDs of this test, others may be published concurrently
+        names = {did["name"] for did in dids}
         opendata_dids = rucio_client.list_opendata_dids(public=True)["dids"]
-        opendata_dids = [d for d in opendata_dids if d not in opendata_dids_before]
+        opendata_dids = [d for d in opendata_dids if (d["scope"], d["name"]) not in opendata_dids_before and d["name"] in names]
         opendata_dids.sort(key=lambda x: x["name"])
 
         # only 2 and 3 should be present in response
@@ -563,8 +597,9 @@ class TestOpenDataClient:
             assert did_output["name"] == did_input["name"], "Name does not match"
             assert did_output["state"] == "PUBLIC", "State does not match"
 
-    def test_opendata_show_client(self, mock_scope, rucio_client):
-        name = did_name_generator(did_type="dataset")
+    @pytest.mark.noparallel(reason="Changes in configuration values")
+    def test_opendata_show_client(self, mock_scope, opendata_did_pool, rucio_client):
+        name = next(opendata_did_pool)["name"]
         scope = str(mock_scope)
 
         if not config_has_section('opendata'):
@@ -572,11 +607,6 @@ class TestOpenDataClient:
 
         config_set('opendata', 'rse_expression', OPENDATA_RSE_EXPRESSION)
 
-        # Add it as a DID
-        rucio_client.add_did(scope=scope, name=name, did_type="DATASET")
-
-        # Add it as open data
-        rucio_client.add_opendata_did(scope=scope, name=name)
         opendata_did = rucio_client.get_opendata_did(scope=scope, name=name)
 
         assert opendata_did["scope"] == scope, "Scope does not match"
@@ -600,7 +630,6 @@ class TestOpenDataClient:
         assert meta == {}, "'meta' should be empty"
 
 
-@pytest.mark.noparallel(reason="Changes in configuration values and race conditions")
 class TestOpenDataAPI:
     api_endpoint = '/opendata/dids'
     api_endpoint_public = '/opendata/public/dids'
@@ -618,6 +647,71 @@ class TestOpenDataAPI:
         )
         assert response.status_code == 200, f"Expected 200 OK, got {response.status_code}"
 
+    def test_opendata_api_list_cursor(self, rest_client, auth_token, root_account, mock_scope, db_write_session):
+        # A shared random prefix keeps our DIDs next to each other even if other tests add DIDs meanwhile
+        prefix = f"cursor_{generate_uuid()}_"
+        names = sorted(did_name_generator(did_type="dataset", name_prefix=prefix) for _ in range(5))
+        dids = [{"scope": mock_scope, "name": name} for name in names]
+        add_dids([{**did, "type": DIDType.DATASET} for did in dids], account=root_account, session=db_write_session)
+        opendata.add_opendata_dids(dids=dids, session=db_write_session)
+        db_write_session.commit()
+
+        # Start right before the first DID and follow the cursors
+        limit = 2
+        max_pages = math.ceil(len(names) / limit) + 1
+        after = _encode_cursor(str(mock_scope), prefix)
+        listed = []
+        pages = 0
+        while after is not None and names[-1] not in listed:
+            pages += 1
+            assert pages <= max_pages, f"Following the cursors should take at most {max_pages} pages"
+            response = rest_client.get(self.api_endpoint, query_string={"limit": limit, "after": after},
+                                       headers=headers(auth(auth_token)))
+            assert response.status_code == 200, f"Expected 200 OK, got {response.status_code}"
+            page = response.get_json()
+            assert 0 < len(page["dids"]) <= limit, f"A page should hold between 1 and {limit} DIDs"
+            if len(page["dids"]) == limit:
+                assert page["next_cursor"] is not None, "A full page should come with a cursor"
+            listed.extend(did["name"] for did in page["dids"])
+            after = page["next_cursor"]
+
+        assert listed[:len(names)] == names, "Following the cursors should list all DIDs once and in order"
+
+        # A page that is not full is the last one
+        response = rest_client.get(self.api_endpoint, query_string={"limit": limit, "after": _encode_cursor("zzzzzzzzzz", "zzzzzzzzzz")},
+                                   headers=headers(auth(auth_token)))
+        assert response.status_code == 200, f"Expected 200 OK, got {response.status_code}"
+        page = response.get_json()
+        assert page["dids"] == [], "No DIDs should be listed after the last possible cursor"
+        assert page["next_cursor"] is None, "The last page should not come with a cursor"
+
+    @pytest.mark.parametrize("query", ["limit=abc", "limit=-1", "offset=-1", "offset=10000001",
+                                       "after=not-a-cursor", "after=bm9zZXBhcmF0b3I="])
+    def test_opendata_public_api_list_invalid_pagination(self, rest_client, query):
+        response = rest_client.get(
+            f"{self.api_endpoint_public}?{query}",
+        )
+        assert response.status_code == 400, f"Expected 400 Bad Request, got {response.status_code}"
+
+    @pytest.mark.parametrize("query", [{}, {"files": "1"}])
+    def test_opendata_public_api_get_etag(self, rest_client, root_account, mock_scope, db_write_session, query):
+        name = did_name_generator(did_type="dataset")
+        add_did(scope=mock_scope, name=name, account=root_account, did_type=DIDType.DATASET, session=db_write_session)
+        opendata.add_opendata_did(scope=mock_scope, name=name, session=db_write_session)
+        close_and_publish(mock_scope, name, session=db_write_session)
+        db_write_session.commit()
+
+        endpoint = f"{self.api_endpoint_public}/{mock_scope}/{name}"
+        response = rest_client.get(endpoint, query_string=query)
+        assert response.status_code == 200, f"Expected 200 OK, got {response.status_code}"
+        etag = response.headers.get("ETag")
+        assert etag, "Expected an ETag on public DID responses"
+        assert "public" in response.headers.get("Cache-Control", "")
+
+        # With files, the second request is a cache hit and takes a different time, which must not change the ETag
+        response = rest_client.get(endpoint, query_string=query, headers={"If-None-Match": etag})
+        assert response.status_code == 304, f"Expected 304 Not Modified, got {response.status_code}"
+
     def test_opendata_api_add_remove(self, rest_client, auth_token, root_account, mock_scope):
         name = did_name_generator(did_type="dataset")
         endpoint = f"{self.api_endpoint}/{mock_scope}/{name}"
@@ -673,7 +767,7 @@ class TestOpenDataAPI:
 class TestOpenDataCLI:
     @staticmethod
     def extract_subcommands(stdout: str):
-        match = re.search(r"(?i)^Commands:\n((?:\s{2,}\w+.*\n)+)", stdout, re.MULTILINE)
+        match = SUBCOMMANDS_SECTION_REGEXP.search(stdout)
         assert match, "Failed to locate subcommands section in help output"
 
         lines = match.group(1).splitlines()
@@ -683,7 +777,7 @@ class TestOpenDataCLI:
 
     @staticmethod
     def extract_options(stdout: str):
-        match = re.search(r"(?i)^Options:\n((?:\s{2,}.+\n)+)", stdout, re.MULTILINE)
+        match = OPTIONS_SECTION_REGEXP.search(stdout)
         assert match, "Failed to locate options section in help output"
 
         options_block = match.group(1)
@@ -691,7 +785,7 @@ class TestOpenDataCLI:
 
         for line in options_block.splitlines():
             # Match all long-form options starting with "--"
-            options.update(re.findall(r"--\w[\w-]*", line))
+            options.update(LONG_OPTION_REGEXP.findall(line))
 
         return options
 
@@ -702,13 +796,12 @@ class TestOpenDataCLI:
         assert "ERROR" in stderr.upper()
 
     def test_opendata_cli_help(self):
-        cmd = "rucio opendata did --help"
-        exitcode, stdout, stderr = execute(cmd)
-        assert exitcode == 0, f"Command '{cmd}' failed with error: {stderr.strip()}"
-        assert "ERROR" not in stderr.upper(), f"Command '{cmd}' failed with error: {stderr.strip()}"
+        # Help output does not need a server, so the command group is invoked in-process
+        result = CliRunner().invoke(opendata_cli, ["did", "--help"])
+        assert result.exit_code == 0, f"Command 'rucio opendata did --help' failed with error: {result.output.strip()}"
 
         subcommands_expected = {"add", "list", "show", "update", "remove"}
-        subcommands = self.extract_subcommands(stdout)
+        subcommands = self.extract_subcommands(result.output)
         assert subcommands == subcommands_expected, f"Expected subcommands {subcommands_expected}, got {subcommands}"
 
     @pytest.mark.parametrize("subcommand, expected_options", [
@@ -719,11 +812,10 @@ class TestOpenDataCLI:
         ("remove", {"--help"}),
     ])
     def test_opendata_cli_options(self, subcommand, expected_options):
-        exitcode, stdout, stderr = execute(f"rucio opendata did {subcommand} --help")
-        assert exitcode == 0
-        assert "ERROR" not in stderr.upper(), f"Command 'rucio opendata {subcommand} --help' failed with error: {stderr.strip()}"
+        result = CliRunner().invoke(opendata_cli, ["did", subcommand, "--help"])
+        assert result.exit_code == 0, f"Command 'rucio opendata did {subcommand} --help' failed with error: {result.output.strip()}"
 
-        options = self.extract_options(stdout)
+        options = self.extract_options(result.output)
         assert options == expected_options, (
             f"Subcommand '{subcommand}': expected options {expected_options}, got {options}"
         )
@@ -776,13 +868,10 @@ class TestOpenDataCLI:
         assert exitcode == 0, f"Failed to list opendata with state draft: {stderr.strip()}"
         assert f"{name}" in stdout, f"Expected {mock_scope}:{name} in opendata list with state draft"
 
-        exitcode, stdout, stderr = execute("rucio opendata did list --state public")
-        assert exitcode == 0, f"Failed to list opendata with state public: {stderr.strip()}"
-        assert f"{name}" not in stdout, f"Expected {mock_scope}:{name} not in opendata list with state public"
-
-        exitcode, stdout, stderr = execute("rucio opendata did list --state suspended")
-        assert exitcode == 0, f"Failed to list opendata with state suspended: {stderr.strip()}"
-        assert f"{name}" not in stdout, f"Expected {mock_scope}:{name} not in opendata list with state suspended"
+        # A DID has a single state, so it cannot be listed as public or suspended
+        with db_session(DatabaseOperationType.READ) as session:
+            opendata_did = opendata.get_opendata_did(scope=mock_scope, name=name, session=session)
+        assert opendata_did["state"] == OpenDataDIDState.DRAFT, f"Expected {mock_scope}:{name} to be in state draft"
 
         exitcode, _, stderr = execute(f"rucio opendata did remove {mock_scope}:{name}")
         assert exitcode == 0, f"Failed to remove opendata DID: {stderr.strip()}"
@@ -23,7 +23,8 @@ import pytest
 from rucio.common.bittorrent import bittorrent_v2_merkle_sha256
 from rucio.common.exception import InvalidType
 from rucio.common.logging import formatted_logger
-from rucio.common.utils import Availability, clone_function, parse_did_filter_from_string, retrying
+from rucio.common.types import InternalScope
+from rucio.common.utils import Availability, clone_function, gateway_update_return_dict, parse_did_filter_from_string, retrying
 
 
 class TestUtils:
@@ -182,6 +183,17 @@ def test_retrying():
     assert len(attempts) == 1
 
 
+def test_gateway_update_return_dict_scope():
+    """ Internal scopes are externalised, external scope strings are left untouched """
+    row = {'scope': InternalScope('mock'), 'name': 'file'}
+    result = gateway_update_return_dict(row)
+    assert result['scope'] == 'mock'
+    assert isinstance(row['scope'], InternalScope)
+
+    external = {'scope': 'mock', 'name': 'file'}
+    assert gateway_update_return_dict(external) is external
+
+
 def test_bittorrent_sa256_merkle(file_factory):
     def _sha256_merkle_via_libtorrent(file, piece_size=0):
         import libtorrent as lt
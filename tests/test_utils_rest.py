@@ -16,7 +16,7 @@ import logging
 import pytest
 from werkzeug import exceptions
 
-from rucio.web.rest.flaskapi.v1.common import param_get_bool
+from rucio.web.rest.flaskapi.v1.common import param_get_bool, parse_scope_name, parse_scope_name_parts
 
 
 @pytest.mark.parametrize(
@@ -68,3 +68,21 @@ def test_param_get_bool(params, kwargs, raise_log, raise_error, caplog):
 
     if raise_log:
         assert "Booleans should only accept true/false. Please change 0/1 to true/false." in caplog.text
+
+
+@pytest.mark.parametrize(
+    'scope,name',
+    [
+        ('mock', 'file'),
+        ('user.jdoe', 'file.with.dots_and-dashes'),
+        ('mock', ''),
+    ],
+)
+def test_parse_scope_name_parts(scope, name):
+    """ parse_scope_name_parts agrees with parse_scope_name on the joined string """
+    assert parse_scope_name_parts(scope, name, vo=None) == parse_scope_name(f"{scope}/{name}", vo=None)
+
+
+def test_parse_scope_name_parts_invalid():
+    with pytest.raises(ValueError):
+        parse_scope_name_parts('', 'file', vo=None)
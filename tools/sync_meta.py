@@ -20,10 +20,15 @@ base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(base_path)
 os.chdir(base_path)
 
+import re  # noqa: E402
 import sys  # noqa: E402
+import threading  # noqa: E402
 import traceback  # noqa: E402
+from argparse import ArgumentParser  # noqa: E402
+from concurrent.futures import ThreadPoolExecutor  # noqa: E402
 
 from rucio.client import Client  # noqa: E402
+from rucio.common.constants import DEFAULT_VO  # noqa: E402
 from rucio.common.exception import Duplicate  # noqa: E402
 
 UNKNOWN = 3
@@ -31,8 +36,121 @@ CRITICAL = 2
 WARNING = 1
 OK = 0
 
+# Keys are independent of each other, so they are synced concurrently
+MAX_WORKERS = 8
+
+# The client's requests session is not thread safe, so each worker gets its own
+_thread_data = threading.local()
+
+
+def get_client():
+    if not hasattr(_thread_data, 'client'):
+        _thread_data.client = Client()
+    return _thread_data.client
+
+
+def sync_key(key, key_type, value_regexp, values, existing_keys, existing_scopes):
+    """
+    Registers a key with its values, and the scopes for the project values.
+    Returns the messages to print, so that the output of the workers does not interleave.
+    """
+    messages = []
+    c = get_client()
+    try:
+        existing_values = set()
+        if key in existing_keys:
+            messages.append(f'{key} already added')
+            if values:
+                existing_values = set(c.list_values(key=key))
+        else:
+            try:
+                c.add_key(key=key, key_type=key_type, value_regexp=value_regexp)
+            except Duplicate:
+                messages.append(f'{key} already added')
+
+        for value in values:
+
+            if value in existing_values:
+                messages.append(f'{key}:{value} already added')
+            else:
+                try:
+                    c.add_value(key=key, value=value)
+                except Duplicate:
+                    messages.append(f'{key}:{value} already added')
+
+            if key == 'project':
+                if value in existing_scopes:
+                    messages.append(f'Scope {value} already added')
+                else:
+                    try:
+                        c.add_scope('root', value)
+                    except Duplicate:
+                        messages.append(f'Scope {value} already added')
+    except Exception:
+        errno, errstr = sys.exc_info()[:2]
+        trcbck = traceback.format_exc()
+        messages.append('Interrupted processing with %s %s %s.' % (errno, errstr, trcbck))
+    return messages
+
+
+def sync_local(meta_keys, vo):
+    """
+    Registers the keys, values and project scopes directly in the database of this
+    server, through the core functions and in a single transaction.
+    """
+    from rucio.common.types import InternalAccount, InternalScope
+    from rucio.core.meta_conventions import add_key, add_value, list_keys, list_values
+    from rucio.core.scope import add_scope, list_scopes
+    from rucio.db.sqla.constants import DatabaseOperationType
+    from rucio.db.sqla.session import db_session
+
+    account = InternalAccount('root', vo=vo)
+    with db_session(DatabaseOperationType.WRITE) as session:
+        # A failed insert aborts the transaction, so existing entries are skipped up front
+        existing_keys = set(list_keys(session=session))
+        existing_scopes = set(list_scopes(session=session))
+
+        for key, key_type, value_regexp, values in meta_keys:
+            existing_values = set()
+            if key in existing_keys:
+                print(f'{key} already added')
+                if values:
+                    existing_values = set(list_values(key=key, session=session))
+            else:
+                add_key(key=key, key_type=key_type, value_regexp=value_regexp, session=session)
+
+            for value in values:
+                if value in existing_values:
+                    print(f'{key}:{value} already added')
+                else:
+                    add_value(key=key, value=value, session=session)
+
+                if key == 'project':
+                    scope = InternalScope(value, vo=vo)
+                    if scope in existing_scopes:
+                        print(f'Scope {value} already added')
+                    else:
+                        add_scope(scope=scope, account=account, session=session)
+
+
 if __name__ == '__main__':
 
+    parser = ArgumentParser(
+        prog="sync_meta.py",
+        description="Register the default DID metadata keys, values and project scopes."
+    )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Write directly to the database configured on this server instead of going through the REST API.",
+    )
+    parser.add_argument(
+        "--vo",
+        default=DEFAULT_VO,
+        help="VO to register the project scopes in, with --local. Remote syncs use the VO of the client configuration.",
+    )
+    args = parser.parse_args()
+
     meta_keys = [('project', 'ALL', None, ['data13_hip', 'NoProjectDefined']),
                  ('run_number', 'ALL', None, ['NoRunNumberDefined']),
                  ('stream_name', 'ALL', None, ['NoStreamNameDefined']),
@@ -43,29 +161,29 @@ if __name__ == '__main__':
                  ('guid', 'FILE', r'^(\{){0,1}[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}(\}){0,1}$', []),
                  ('events', 'DERIVED', r'^\d+$', [])]
 
-    c = Client()
-    for key, key_type, value_regexp, values in meta_keys:
-        try:
+    # Catch a broken regular expression before anything is registered
+    for key, _, value_regexp, _ in meta_keys:
+        if value_regexp:
             try:
-                c.add_key(key=key, key_type=key_type, value_regexp=value_regexp)
-            except Duplicate:
-                print(f'{key} already added')
+                re.compile(value_regexp)
+            except re.error as error:
+                print(f'Invalid value_regexp for {key}: {error}')
+                sys.exit(CRITICAL)
 
-            for value in values:
+    if args.local:
+        sync_local(meta_keys, vo=args.vo)
+        sys.exit(OK)
 
-                try:
-                    c.add_value(key=key, value=value)
-                except Duplicate:
-                    print(f'{key}:{value} already added')
+    # Fetch what is already registered once, so that re-running the sync only
+    # sends the missing keys, values and scopes instead of failing on duplicates
+    c = get_client()
+    existing_keys = set(c.list_keys())
+    existing_scopes = set(c.list_scopes())
 
-                if key == 'project':
-                    try:
-                        c.add_scope('root', value)
-                    except Duplicate:
-                        print(f'Scope {value} already added')
-        except Exception:
-            errno, errstr = sys.exc_info()[:2]
-            trcbck = traceback.format_exc()
-            print('Interrupted processing with %s %s %s.' % (errno, errstr, trcbck))
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(lambda entry: sync_key(*entry, existing_keys, existing_scopes), meta_keys)
+        for messages in results:
+            for message in messages:
+                print(message)
 
     sys.exit(OK)